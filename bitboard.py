@@ -0,0 +1,82 @@
+# bitboard.py
+"""Bitboard helpers and precomputed attack masks for the 3D chess game."""
+
+from functools import lru_cache
+from itertools import product
+from typing import Callable, Iterator, Tuple
+
+# A bitboard is a Python int with bit i set for flat square i = (x * ny + y) * nz + z.
+# Python ints are unbounded, so one int covers a board of any size.
+Bitboard = int
+
+
+def iter_bits(bits: Bitboard) -> Iterator[int]:
+    """Yields the index of each set bit, lowest first."""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+def _leaper_attacks(nx: int, ny: int, nz: int, is_step: Callable[[int, int, int], bool]) -> Tuple[Bitboard, ...]:
+    """
+    Builds the attack bitboard of a non-sliding piece from every square.
+
+    :param is_step: Predicate on (|dx|, |dy|, |dz|) telling which offsets the piece may take.
+    :return: One bitboard per flat square index.
+    """
+    reach = max(nx, ny, nz)
+    offsets = [
+        (dx, dy, dz)
+        for dx, dy, dz in product(range(-reach, reach + 1), repeat=3)
+        if (dx, dy, dz) != (0, 0, 0) and is_step(abs(dx), abs(dy), abs(dz))
+    ]
+    attacks = []
+    for x, y, z in product(range(nx), range(ny), range(nz)):
+        bits = 0
+        for dx, dy, dz in offsets:
+            tx, ty, tz = x + dx, y + dy, z + dz
+            if 0 <= tx < nx and 0 <= ty < ny and 0 <= tz < nz:
+                bits |= 1 << ((tx * ny + ty) * nz + tz)
+        attacks.append(bits)
+    return tuple(attacks)
+
+
+@lru_cache(maxsize=None)
+def knight_attacks(nx: int, ny: int, nz: int) -> Tuple[Bitboard, ...]:
+    """Returns the knight attack bitboard for every square of the board."""
+    # The sum of the squares of the movement along each axis equals 5
+    return _leaper_attacks(nx, ny, nz, lambda dx, dy, dz: dx * dx + dy * dy + dz * dz == 5)
+
+
+@lru_cache(maxsize=None)
+def king_attacks(nx: int, ny: int, nz: int) -> Tuple[Bitboard, ...]:
+    """Returns the king attack bitboard for every square of the board."""
+    # One square in any direction
+    return _leaper_attacks(nx, ny, nz, lambda dx, dy, dz: max(dx, dy, dz) == 1)
+
+
+@lru_cache(maxsize=None)
+def between_masks(nx: int, ny: int, nz: int) -> Tuple[Tuple[Bitboard, ...], ...]:
+    """
+    Returns the squares strictly between every pair of squares on a common line.
+
+    :return: A table indexed [from][to] by flat square index, holding the
+             bitboard of the squares in between; 0 for pairs not on a line.
+    """
+    size = nx * ny * nz
+    table = []
+    for x, y, z in product(range(nx), range(ny), range(nz)):
+        row = [0] * size
+        for sx, sy, sz in product((-1, 0, 1), repeat=3):
+            if sx == sy == sz == 0:
+                continue
+            bits = 0
+            tx, ty, tz = x + sx, y + sy, z + sz
+            while 0 <= tx < nx and 0 <= ty < ny and 0 <= tz < nz:
+                idx = (tx * ny + ty) * nz + tz
+                row[idx] = bits
+                bits |= 1 << idx
+                tx, ty, tz = tx + sx, ty + sy, tz + sz
+        table.append(tuple(row))
+    return tuple(table)
@@ -3,14 +3,50 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import Optional, Tuple, Dict
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+from typing import Optional, Tuple, Dict, Union
+import copy
 import logging
-from pieces import PieceFactory, Piece, King
-from utils import is_clear_path
+from functools import lru_cache
+from itertools import product
+from bitboard import iter_bits, knight_attacks, king_attacks, between_masks
+from pieces import PieceFactory, Piece, King, PIECE_CODES, COLOR_CODES, PAWN_DIRECTIONS
+from utils import is_clear_path_many
 
 Position = Tuple[int, int, int]
 logger = logging.getLogger(__name__)
 
+# Bits of the per-square flags array.
+MOVED = 1
+
+# Map piece types to markers and colors
+_MARKERS = {
+    'P': 'o',  # Pawn
+    'R': 's',  # Rook
+    'N': '^',  # Knight
+    'B': 'D',  # Bishop
+    'Q': '*',  # Queen
+    'K': 'X',  # King
+}
+_FACE_COLORS = {
+    'W': 'white',
+    'B': 'black',
+}
+_EDGE_COLORS = {
+    'W': 'black',
+    'B': 'white',
+}
+
+# Hot Board methods with the board dimensions inlined as literals
+_SPECIALIZED_METHODS = """
+def is_within_bounds(self, position):
+    x, y, z = position
+    return (x | y | z) >= 0 and x < {nx} and y < {ny} and z < {nz}
+
+def _encode(self, x, y, z):
+    return x * {stride_x} + y * {stride_y} + z
+"""
+
 
 class Board:
     """Represents the 3D chess board and manages game state."""
@@ -27,11 +63,63 @@ class Board:
         self._nx = nx
         self._ny = ny
         self._nz = nz
-        self._board: np.ndarray = np.full((nx, ny, nz), None, dtype=object)
-        self._pieces: Dict[Position, Piece] = {}
+        self._stride_y = nz
+        self._stride_x = ny * nz
+        # Flat mailbox: one byte per square, 0 for empty, otherwise a piece code.
+        self._mailbox: np.ndarray = np.zeros(nx * ny * nz, dtype=np.uint8)
+        # Parallel per-square flags, e.g. whether the occupant has moved.
+        self._flags: np.ndarray = np.zeros(nx * ny * nz, dtype=np.int8)
+        # Pieces keyed by flat square index, so lookups hash a plain int
+        self._pieces: Dict[int, Piece] = {}
+        # Bitboards: bit i is set iff a piece of that (color, type) is on square i.
+        self._bitboards: Dict[Tuple[str, str], int] = {
+            (color, symbol): 0 for color in COLOR_CODES for symbol in PIECE_CODES
+        }
+        # Union of each color's bitboards, for own-capture and blocker tests
+        self._occupancy: Dict[str, int] = {color: 0 for color in COLOR_CODES}
+        # Knight and king destinations from each square, shared per board shape
+        self._knight_attacks = knight_attacks(nx, ny, nz)
+        self._king_attacks = king_attacks(nx, ny, nz)
+        # Squares strictly between two squares on a line, indexed [from][to]
+        self._between = between_masks(nx, ny, nz)
+        # One shared (x, y, z) tuple per square, indexed by flat square index
+        self._positions = self._square_positions(nx, ny, nz)
         self._piece_factory = piece_factory or PieceFactory()
+        # Matplotlib state, created lazily by visualize()
+        self._fig = None
+        self._ax = None
+        self._piece_scatters: Dict[Tuple[str, str], object] = {}
+        self._piece_texts: list = []
         self.initialize_board()
 
+    @classmethod
+    @lru_cache(maxsize=None)
+    def specialize(cls, nx: int, ny: int, nz: int) -> type:
+        """
+        Returns a Board subclass with fixed dimensions compiled in as constants.
+
+        The subclass's hot methods read literal bounds and strides instead of
+        instance attributes. Calling it takes only an optional piece factory.
+
+        :param nx: Number of layers in the X-direction (depth).
+        :param ny: Number of rows in the Y-direction.
+        :param nz: Number of columns in the Z-direction.
+        :return: The specialized Board subclass, cached per shape.
+        """
+        namespace: Dict[str, object] = {'__name__': __name__}
+        source = _SPECIALIZED_METHODS.format(nx=nx, ny=ny, nz=nz, stride_x=ny * nz, stride_y=nz)
+        exec(source, namespace)
+
+        def __init__(self, piece_factory: Optional[PieceFactory] = None):
+            cls.__init__(self, nx, ny, nz, piece_factory)
+
+        attributes = {'__init__': __init__, 'NX': nx, 'NY': ny, 'NZ': nz}
+        for name in ('is_within_bounds', '_encode'):
+            method = namespace[name]
+            method.__doc__ = getattr(cls, name).__doc__
+            attributes[name] = method
+        return type(f"{cls.__name__}{nx}x{ny}x{nz}", (cls,), attributes)
+
     def initialize_board(self) -> None:
         """Initializes the board with the starting positions of all pieces."""
         logger.info("Initializing the board.")
@@ -49,92 +137,150 @@ class Board:
         :param color: 'W' for white or 'B' for black.
         :param start_x: The starting X-coordinate for the pieces.
         """
-        direction = 1 if color == 'W' else -1
-
-        # Place pawns
-        pawn_row = start_x + direction
-        for y in range(self._ny):
-            for z in range(self._nz):
-                position = (pawn_row, y, z)
-                pawn = self._piece_factory.create_piece('P', color, position)
-                self.set_piece(position, pawn)
-
-        # Place rooks at the corners
-        rook_positions = [
-            (start_x, 0, 0),
-            (start_x, 0, self._nz - 1),
-            (start_x, self._ny - 1, 0),
-            (start_x, self._ny - 1, self._nz - 1),
-        ]
-        for position in rook_positions:
-            rook = self._piece_factory.create_piece('R', color, position)
-            self.set_piece(position, rook)
-
-        # Place knights next to rooks
-        knight_positions = [
-            (start_x, 0, 1),
-            (start_x, 0, self._nz - 2),
-            (start_x, self._ny - 1, 1),
-            (start_x, self._ny - 1, self._nz - 2),
-        ]
-        for position in knight_positions:
-            knight = self._piece_factory.create_piece('N', color, position)
-            self.set_piece(position, knight)
-
-        # Place bishops next to knights
-        bishop_positions = [
-            (start_x, 0, 2),
-            (start_x, 0, self._nz - 3),
-            (start_x, self._ny - 1, 2),
-            (start_x, self._ny - 1, self._nz - 3),
-        ]
-        for position in bishop_positions:
-            bishop = self._piece_factory.create_piece('B', color, position)
-            self.set_piece(position, bishop)
+        pawn_row = start_x + PAWN_DIRECTIONS[color]
+
+        for symbol, squares in self._placement_template(self._ny, self._nz):
+            x = pawn_row if symbol == 'P' else start_x
+            for y, z in squares:
+                position = (x, y, z)
+                # Narrow boards push some template squares off the board; set_piece warns about those
+                if self.is_within_bounds(position):
+                    position = self._positions[self._encode(x, y, z)]
+                piece = self._piece_factory.create_piece(symbol, color, position)
+                self.set_piece(position, piece)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _placement_template(ny: int, nz: int) -> Tuple[Tuple[str, Tuple[Tuple[int, int], ...]], ...]:
+        """
+        Returns the (y, z) squares of each piece type, in placement order.
+
+        Pawns fill their whole row; the other pieces share the back row, so on
+        narrow boards a later type overwrites an earlier one on the same square.
 
+        :param ny: Number of rows in the Y-direction.
+        :param nz: Number of columns in the Z-direction.
+        :return: A tuple of (piece type, squares) pairs.
+        """
         # Calculate central positions for queens and kings
-        center_y = self._ny // 2
-        center_z = self._nz // 2
-
-        # Place queens
-        queen_positions = [
-            (start_x, center_y - 1, center_z - 1),
-            (start_x, center_y - 1, center_z),
-        ]
-        for position in queen_positions:
-            queen = self._piece_factory.create_piece('Q', color, position)
-            self.set_piece(position, queen)
-
-        # Place kings
-        king_positions = [
-            (start_x, center_y, center_z - 1),
-            (start_x, center_y, center_z),
-        ]
-        for position in king_positions:
-            king = self._piece_factory.create_piece('K', color, position)
-            self.set_piece(position, king)
+        center_y = ny // 2
+        center_z = nz // 2
+
+        return (
+            # Pawns fill the row in front of the back row
+            ('P', tuple(product(range(ny), range(nz)))),
+            # Rooks at the corners
+            ('R', ((0, 0), (0, nz - 1), (ny - 1, 0), (ny - 1, nz - 1))),
+            # Knights next to rooks
+            ('N', ((0, 1), (0, nz - 2), (ny - 1, 1), (ny - 1, nz - 2))),
+            # Bishops next to knights
+            ('B', ((0, 2), (0, nz - 3), (ny - 1, 2), (ny - 1, nz - 3))),
+            # Queens and kings in the center
+            ('Q', ((center_y - 1, center_z - 1), (center_y - 1, center_z))),
+            ('K', ((center_y, center_z - 1), (center_y, center_z))),
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _square_positions(nx: int, ny: int, nz: int) -> Tuple[Position, ...]:
+        """Returns the (x, y, z) tuple of every square, in flat index order."""
+        return tuple(product(range(nx), range(ny), range(nz)))
 
     def move_piece(self, from_pos: Position, to_pos: Position) -> bool:
         """Moves a piece from one position to another if the move is valid."""
         piece = self.get_piece(from_pos)
         if piece and piece.is_valid_move(to_pos, self):
-            self.set_piece(to_pos, piece)
-            self.set_piece(from_pos, None)
-            piece.position = to_pos
-            logger.info(f"Moved {piece} from {from_pos} to {to_pos}.")
+            self._apply_move(from_pos, to_pos, piece)
             return True
         else:
-            logger.warning(f"Failed to move piece from {from_pos} to {to_pos}.")
+            logger.warning("Failed to move piece from %s to %s.", from_pos, to_pos)
             return False
 
+    def _apply_move(self, from_pos: Position, to_pos: Position, piece: Piece) -> None:
+        """Moves a piece without validating the move; callers must have done so."""
+        self.set_piece(to_pos, piece)
+        self.set_piece(from_pos, None)
+        to_idx = self._encode(*to_pos)
+        self._flags[to_idx] |= MOVED
+        piece.position = self._positions[to_idx]
+        logger.info("Moved %s from %s to %s.", piece, from_pos, to_pos)
+
+    def are_valid_moves(self, piece: Piece, to_positions: np.ndarray) -> np.ndarray:
+        """
+        Checks many destinations for one piece at once, e.g. for move generation.
+
+        The movement rules and, for sliding pieces, the path checks are
+        evaluated as array operations over all destinations.
+
+        :param piece: The piece to move.
+        :param to_positions: An integer array of destinations, shape (n, 3).
+        :return: A boolean array of shape (n,), True where the move is valid.
+        """
+        tos = np.asarray(to_positions, dtype=np.intp).reshape(-1, 3)
+        fx, fy, fz = piece.position
+        tx, ty, tz = tos.T
+        dx, dy, dz = tx - fx, ty - fy, tz - fz
+        adx, ady, adz = np.abs(dx), np.abs(dy), np.abs(dz)
+        steps = np.maximum(np.maximum(adx, ady), adz)
+        valid = (tos >= 0).all(axis=1) & (tx < self._nx) & (ty < self._ny) & (tz < self._nz) & (steps != 0)
+
+        # Occupants of the destinations; rejected rows read square 0 and stay False
+        codes = self._mailbox[np.where(valid, tx * self._stride_x + ty * self._stride_y + tz, 0)]
+        empty = codes == 0
+        own = ~empty & (codes >> 4 == COLOR_CODES[piece.color])
+
+        symbol = piece.symbol
+        if symbol == 'P':
+            # Forward onto an empty square, or diagonally onto an enemy piece
+            advance = (dx == PAWN_DIRECTIONS[piece.color]) & (dz == 0)
+            return valid & advance & (((dy == 0) & empty) | ((ady == 1) & ~empty & ~own))
+
+        valid &= ~own
+        if symbol == 'N':
+            valid &= dx * dx + dy * dy + dz * dz == 5
+        elif symbol == 'K':
+            valid &= steps == 1
+        else:
+            # is_clear_path_many also rejects destinations off the piece's lines
+            moving = (dx != 0).astype(np.intp) + (dy != 0) + (dz != 0)
+            if symbol == 'R':
+                valid &= moving == 1
+            elif symbol == 'B':
+                valid &= moving >= 2
+            valid[valid] = is_clear_path_many(self, piece.position, tos[valid])
+        return valid
+
 
     def is_within_bounds(self, position: Position) -> bool:
         """Checks if a position is within the board boundaries."""
         x, y, z = position
-        return 0 <= x < self._nx and 0 <= y < self._ny and 0 <= z < self._nz
-
-    def get_piece(self, position: Position) -> Optional[Piece]:
-        """Returns the piece at a given position, or None if empty."""
+        # The OR of the coordinates is negative iff any of them is
+        return (x | y | z) >= 0 and x < self._nx and y < self._ny and z < self._nz
+
+    def _encode(self, x: int, y: int, z: int) -> int:
+        """Returns the flat mailbox index of the square (x, y, z)."""
+        return x * self._stride_x + y * self._stride_y + z
+
+    def _decode(self, idx: int) -> Position:
+        """Returns the (x, y, z) square for a flat mailbox index."""
+        return self._positions[idx]
+
+    def occupied(self, idx: int) -> bool:
+        """Checks if the square at the given flat index holds a piece."""
+        return self._mailbox[idx] != 0
+
+    def color_of(self, idx: int) -> int:
+        """Returns the color code of the piece at the given flat index."""
+        return self._mailbox[idx] >> 4
+
+    def get_piece(self, position: Union[Position, int]) -> Optional[Piece]:
+        """Returns the piece at a given position or flat index, or None if empty."""
+        if isinstance(position, tuple):
+            x, y, z = position
+            # Off-board tuples would otherwise encode onto a real square
+            if (x | y | z) < 0 or x >= self._nx or y >= self._ny or z >= self._nz:
+                return None
+            position = x * self._stride_x + y * self._stride_y + z
         return self._pieces.get(position)
 
     def set_piece(self, position: Position, piece: Optional[Piece]) -> None:
@@ -145,100 +291,167 @@ class Board:
         :param piece: An instance of Piece or None to clear the position.
         """
         if self.is_within_bounds(position):
+            idx = self._encode(*position)
+            previous = self._pieces.get(idx)
+            if previous:
+                self._bitboards[(previous.color, previous.symbol)] &= ~(1 << idx)
+                self._occupancy[previous.color] &= ~(1 << idx)
+            self._flags[idx] = 0
             if piece:
-                self._pieces[position] = piece
-                self._board[position] = piece
-                logger.debug(f"Placed {piece} at {position}.")
+                self._pieces[idx] = piece
+                self._mailbox[idx] = COLOR_CODES[piece.color] << 4 | PIECE_CODES[piece.symbol]
+                self._bitboards[(piece.color, piece.symbol)] |= 1 << idx
+                self._occupancy[piece.color] |= 1 << idx
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Placed %s at %s.", piece, position)
             else:
-                self._pieces.pop(position, None)
-                self._board[position] = None
-                logger.debug(f"Cleared position {position}.")
+                self._pieces.pop(idx, None)
+                self._mailbox[idx] = 0
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Cleared position %s.", position)
         else:
-            logger.warning(f"Attempted to set piece at out-of-bounds position {position}.")
-
-    def visualize(self) -> None:
-            """Visualizes the board using Matplotlib."""
-            logger.info("Visualizing the board.")
-
-            try:
-                with plt.style.context('default'):
-                    fig = plt.figure(figsize=(10, 7))
-                    ax = fig.add_subplot(111, projection='3d')
-
-                    # Set up the grid lines
-                    ax.set_xticks(range(self._nx))
-                    ax.set_yticks(range(self._ny))
-                    ax.set_zticks(range(self._nz))
-                    ax.set_xlim(-0.5, self._nx - 0.5)
-                    ax.set_ylim(-0.5, self._ny - 0.5)
-                    ax.set_zlim(-0.5, self._nz - 0.5)
-                    ax.set_xlabel('X-axis (Layers)')
-                    ax.set_ylabel('Y-axis (Rows)')
-                    ax.set_zlabel('Z-axis (Columns)')
-                    ax.set_title('3D Chess Board')
-
-                    # Draw grid lines
-                    for x in range(self._nx):
-                        ax.plot([x, x], [0, self._ny - 1], [0, 0], color='gray', alpha=0.2)
-                        ax.plot([x, x], [0, 0], [0, self._nz - 1], color='gray', alpha=0.2)
-                    for y in range(self._ny):
-                        ax.plot([0, self._nx - 1], [y, y], [0, 0], color='gray', alpha=0.2)
-                        ax.plot([0, 0], [y, y], [0, self._nz - 1], color='gray', alpha=0.2)
-                    for z in range(self._nz):
-                        ax.plot([0, self._nx - 1], [0, 0], [z, z], color='gray', alpha=0.2)
-                        ax.plot([0, 0], [0, self._ny - 1], [z, z], color='gray', alpha=0.2)
-
-                    # Map piece types to markers and colors
-                    marker_map = {
-                        'P': 'o',  # Pawn
-                        'R': 's',  # Rook
-                        'N': '^',  # Knight
-                        'B': 'D',  # Bishop
-                        'Q': '*',  # Queen
-                        'K': 'X',  # King
-                    }
-                    color_map = {
-                        'W': 'white',
-                        'B': 'black',
-                    }
-                    edge_color_map = {
-                        'W': 'black',
-                        'B': 'white',
-                    }
-
-                    # Plot each piece
-                    for position, piece in self._pieces.items():
-                        x, y, z = position
-                        marker = marker_map.get(piece.__class__.__name__[0], 'o')
-                        facecolor = color_map.get(piece.color, 'gray')
-                        edgecolor = edge_color_map.get(piece.color, 'black')
-                        ax.scatter(
-                            x,
-                            y,
-                            z,
-                            marker=marker,
-                            s=200,  # Size of the marker
-                            c=facecolor,
-                            edgecolors=edgecolor,
-                            linewidths=1.5,
-                            alpha=0.9,
-                        )
-                        # Annotate the piece
-                        ax.text(
-                            x,
-                            y,
-                            z,
-                            f"{piece.__class__.__name__[0]}",
-                            color='red' if piece.color == 'W' else 'yellow',
-                            fontsize=9,
-                            ha='center',
-                            va='center',
-                        )
-
-                    plt.tight_layout()
-                    plt.show()
-            except Exception as e:
-                logger.error(f"Error during visualization: {e}")
+            logger.warning("Attempted to set piece at out-of-bounds position %s.", position)
+
+    def clone(self) -> 'Board':
+        """
+        Returns an independent copy of the board, e.g. for a search node.
+
+        The arrays are copied in bulk and each piece is shallow-copied, which
+        is much cheaper than copy.deepcopy. Shape-dependent tables and the
+        piece factory are shared, and the copy starts without a figure.
+        """
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new._mailbox = self._mailbox.copy()
+        new._flags = self._flags.copy()
+        new._pieces = {idx: copy.copy(piece) for idx, piece in self._pieces.items()}
+        new._bitboards = dict(self._bitboards)
+        new._occupancy = dict(self._occupancy)
+        new._fig = None
+        new._ax = None
+        new._piece_scatters = {}
+        new._piece_texts = []
+        return new
+
+    def clear(self) -> None:
+        """Removes every piece from the board."""
+        self._mailbox.fill(0)
+        self._flags.fill(0)
+        self._pieces.clear()
+        for key in self._bitboards:
+            self._bitboards[key] = 0
+        for color in self._occupancy:
+            self._occupancy[color] = 0
+
+    def visualize(self, block: bool = False) -> None:
+        """
+        Visualizes the board using Matplotlib.
+
+        The figure, axes and grid are built on the first call and reused
+        afterwards; later calls only redraw the pieces.
+
+        :param block: Whether to block until the window is closed.
+        """
+        logger.info("Visualizing the board.")
+
+        try:
+            first_draw = self._fig is None or not plt.fignum_exists(self._fig.number)
+            if first_draw:
+                self._init_figure()
+            self._draw_pieces()
+
+            if first_draw:
+                plt.tight_layout()
+            else:
+                self._fig.canvas.draw_idle()
+            if block:
+                plt.show()
+            else:
+                plt.show(block=False)
+                plt.pause(0.001)
+        except Exception as e:
+            logger.error("Error during visualization: %s", e)
+
+    def _init_figure(self) -> None:
+        """Creates the persistent figure, axes and grid lines."""
+        with plt.style.context('default'):
+            fig = plt.figure(figsize=(10, 7))
+            ax = fig.add_subplot(111, projection='3d')
+
+            # Set up the grid lines
+            ax.set_xticks(range(self._nx))
+            ax.set_yticks(range(self._ny))
+            ax.set_zticks(range(self._nz))
+            ax.set_xlim(-0.5, self._nx - 0.5)
+            ax.set_ylim(-0.5, self._ny - 0.5)
+            ax.set_zlim(-0.5, self._nz - 0.5)
+            ax.set_xlabel('X-axis (Layers)')
+            ax.set_ylabel('Y-axis (Rows)')
+            ax.set_zlabel('Z-axis (Columns)')
+            ax.set_title('3D Chess Board')
+
+            # Draw grid lines, one batched collection per axis
+            nx, ny, nz = self._nx, self._ny, self._nz
+            x_segments = (
+                [[(x, 0, 0), (x, ny - 1, 0)] for x in range(nx)]
+                + [[(x, 0, 0), (x, 0, nz - 1)] for x in range(nx)]
+            )
+            y_segments = (
+                [[(0, y, 0), (nx - 1, y, 0)] for y in range(ny)]
+                + [[(0, y, 0), (0, y, nz - 1)] for y in range(ny)]
+            )
+            z_segments = (
+                [[(0, 0, z), (nx - 1, 0, z)] for z in range(nz)]
+                + [[(0, 0, z), (0, ny - 1, z)] for z in range(nz)]
+            )
+            for segments in (x_segments, y_segments, z_segments):
+                ax.add_collection3d(Line3DCollection(np.array(segments), colors='gray', alpha=0.2))
+
+        self._fig = fig
+        self._ax = ax
+        self._piece_scatters = {}
+        self._piece_texts = []
+
+    def _draw_pieces(self) -> None:
+        """Updates the piece markers and labels on the persistent axes."""
+        ax = self._ax
+        labels = []
+
+        # One scatter per (color, type) group, moved rather than redrawn
+        for (color, symbol), bits in self._bitboards.items():
+            indices = np.fromiter(iter_bits(bits), dtype=np.intp, count=bits.bit_count())
+            xs, rest = np.divmod(indices, self._stride_x)
+            ys, zs = np.divmod(rest, self._stride_y)
+
+            scatter = self._piece_scatters.get((color, symbol))
+            if scatter is None:
+                self._piece_scatters[(color, symbol)] = ax.scatter(
+                    xs,
+                    ys,
+                    zs,
+                    marker=_MARKERS.get(symbol, 'o'),
+                    s=200,  # Size of the marker
+                    c=_FACE_COLORS.get(color, 'gray'),
+                    edgecolors=_EDGE_COLORS.get(color, 'black'),
+                    linewidths=1.5,
+                    alpha=0.9,
+                )
+            else:
+                scatter._offsets3d = (xs, ys, zs)
+
+            label_color = 'red' if color == 'W' else 'yellow'
+            labels.extend((x, y, z, symbol, label_color) for x, y, z in zip(xs, ys, zs))
+
+        # Annotate the pieces, reusing text artists from the previous draw
+        texts = self._piece_texts
+        while len(texts) < len(labels):
+            texts.append(ax.text(0, 0, 0, '', fontsize=9, ha='center', va='center'))
+        while len(texts) > len(labels):
+            texts.pop().remove()
+        for text, (x, y, z, symbol, label_color) in zip(texts, labels):
+            text.set_position_3d((x, y, z))
+            text.set_text(symbol)
+            text.set_color(label_color)
 
     def is_game_over(self, opponent_color: str) -> bool:
         """
@@ -249,23 +462,19 @@ class Board:
         :param opponent_color: The color of the opponent ('W' or 'B').
         :return: True if the game is over, False otherwise.
         """
-        logger.info(f"Checking if the game is over for opponent color: {opponent_color}")
+        logger.info("Checking if the game is over for opponent color: %s", opponent_color)
 
         try:
-            # Get all pieces of the opponent's color
-            opponent_pieces: List[Piece] = [
-                piece for piece in self._pieces.values() if piece.color == opponent_color
-            ]
-
-            # Check if the opponent has any kings left
-            opponent_kings = [piece for piece in opponent_pieces if isinstance(piece, King)]
+            # A single zero test on the opponent's king bitboard
+            opponent_kings = self._bitboards[(opponent_color, King.symbol)]
 
-            if not opponent_kings:
-                logger.info(f"No kings left for opponent {opponent_color}. Game over.")
+            if opponent_kings == 0:
+                logger.info("No kings left for opponent %s. Game over.", opponent_color)
                 return True
             else:
-                logger.debug(f"Opponent {opponent_color} has {len(opponent_kings)} king(s) remaining.")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Opponent %s has %d king(s) remaining.", opponent_color, opponent_kings.bit_count())
                 return False
         except Exception as e:
-            logger.error(f"Error while checking if game is over: {e}")
+            logger.error("Error while checking if game is over: %s", e)
             return False
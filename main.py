@@ -28,13 +28,11 @@ def make_move(board: Board, player_color: str) -> None:
             piece = board.get_piece(from_pos)
             if piece and piece.color == player_color:
                 if piece.is_valid_move(to_pos, board):
-                    if board.move_piece(from_pos, to_pos):
-                        print(f"Moved from {from_pos} to {to_pos}")
-                        logger.info(f"Player {player_color} moved from {from_pos} to {to_pos}.")
-                        break
-                    else:
-                        print("Move failed.")
-                        logger.warning(f"Player {player_color}'s move from {from_pos} to {to_pos} failed.")
+                    # Already validated, so skip move_piece's second check
+                    board._apply_move(from_pos, to_pos, piece)
+                    print(f"Moved from {from_pos} to {to_pos}")
+                    logger.info(f"Player {player_color} moved from {from_pos} to {to_pos}.")
+                    break
                 else:
                     print("Invalid move.")
                     logger.warning(f"Invalid move by {player_color} from {from_pos} to {to_pos}.")
@@ -48,7 +46,7 @@ def make_move(board: Board, player_color: str) -> None:
 
 def play_game() -> None:
     """Starts and runs the 3D chess game."""
-    board = Board()
+    board = Board.specialize(8, 4, 4)()
     turn = 0
     players = ['W', 'B']
 
@@ -60,7 +58,7 @@ def play_game() -> None:
         if board.is_game_over(opponent):
             print(f"Player {current_player} wins!")
             logger.info(f"Player {current_player} wins the game.")
-            board.visualize()
+            board.visualize(block=True)
             break
         turn += 1
 
@@ -1,3 +1,4 @@
+import re
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -10,10 +11,56 @@ nz = 4  # Number of columns in the Z-direction
 # Each cell can be empty ('  '), or contain a piece (e.g., 'WK' for White King)
 board = np.full((nx, ny, nz), '  ', dtype=object)
 
+# Integer cell codes: the high nibble is the player, the low nibble the piece type
+player_codes = {'W': 1, 'B': 2}
+piece_codes = {'K': 1, 'Q': 2, 'R': 3, 'B': 4, 'N': 5, 'P': 6}
+cell_codes = {'  ': 0}
+for player_name, player_code in player_codes.items():
+    for piece_name, piece_code in piece_codes.items():
+        cell_codes[player_name + piece_name] = player_code << 4 | piece_code
+# Piece-type nibble for cells the table does not know; check_move rejects it
+_UNKNOWN_PIECE_CODE = 0xF
+
+def cell_code(cell):
+    code = cell_codes.get(cell)
+    if code is None:
+        # Read the owner and type from the string like the rules did before the table
+        if cell.strip() == '':
+            return 0
+        code = player_codes.get(cell[0], 0) << 4 | piece_codes.get(cell[1:2], _UNKNOWN_PIECE_CODE)
+    return code
+
+# Step offsets along a ray, sliced per path check instead of reallocated
+ray_offsets = np.arange(1, max(nx, ny, nz))
+
 # Define the pieces for each player
 pieces = ['K', 'Q', 'R', 'B', 'N', 'P']  # King, Queen, Rook, Bishop, Knight, Pawn
 players = ['W', 'B']  # White and Black
 
+# Knight offsets by absolute value, for O(1) membership tests
+_KNIGHT_DELTA_ABS = frozenset({
+    (2, 1, 0), (1, 2, 0), (2, 0, 1), (1, 0, 2),
+    (0, 2, 1), (0, 1, 2)
+})
+
+# In-bounds knight destinations for every square, for move generation
+def _knight_targets(x, y, z):
+    targets = []
+    for dx in range(-2, 3):
+        for dy in range(-2, 3):
+            for dz in range(-2, 3):
+                if (abs(dx), abs(dy), abs(dz)) not in _KNIGHT_DELTA_ABS:
+                    continue
+                tx, ty, tz = x + dx, y + dy, z + dz
+                if 0 <= tx < nx and 0 <= ty < ny and 0 <= tz < nz:
+                    targets.append((tx, ty, tz))
+    return np.array(targets, dtype=np.int8).reshape(-1, 3)
+
+_KNIGHT_TARGETS = {
+    (x, y, z): _knight_targets(x, y, z)
+    for x in range(nx) for y in range(ny) for z in range(nz)
+}
+
 # Place initial pieces on the board
 def initialize_board():
     # White pieces (Player W)
@@ -97,9 +144,10 @@ def visualize_board():
         for y_coord in range(ny):
             for z_coord in range(nz):
                 piece = board[x_coord, y_coord, z_coord]
-                if piece.strip():
+                code = cell_code(piece)
+                if code:
                     # Use red for one player and green for the other
-                    if piece[0] == 'W':
+                    if code >> 4 == player_codes['W']:
                         color = 'red'
                     else:
                         color = 'green'
@@ -129,14 +177,35 @@ def visualize_board():
     # Display the plot
     plt.show()
 
+# Expected move format: x,y,z
+move_re = re.compile(r'\s*([-+]?\d+)\s*,\s*([-+]?\d+)\s*,\s*([-+]?\d+)\s*\Z')
+
 # Function to convert user input to board indices
 def parse_move(move_str):
-    try:
-        # Expected format: x,y,z
-        x_str, y_str, z_str = move_str.strip().split(',')
-        return int(x_str), int(y_str), int(z_str)
-    except ValueError:
+    match = move_re.match(move_str)
+    if not match:
         return None
+    return int(match[1]), int(match[2]), int(match[3])
+
+# Results of check_move, indexing into move_errors
+(MOVE_OK, MOVE_OUT_OF_BOUNDS, MOVE_NO_PIECE, MOVE_OWN_CAPTURE, MOVE_OFF_PLANE,
+ MOVE_BAD_PAWN, MOVE_BAD_ROOK, MOVE_BAD_BISHOP, MOVE_BAD_KNIGHT, MOVE_BAD_QUEEN,
+ MOVE_BAD_KING, MOVE_BLOCKED, MOVE_UNKNOWN_PIECE) = range(13)
+move_errors = [
+    "",
+    "Positions out of bounds.",
+    "No valid piece at the source position.",
+    "Cannot capture your own piece.",
+    "Pieces can only move in one plane.",
+    "Invalid pawn move.",
+    "Invalid rook move.",
+    "Invalid bishop move.",
+    "Invalid knight move.",
+    "Invalid queen move.",
+    "Invalid king move.",
+    "Path is not clear.",
+    "Unknown piece type.",
+]
 
 # Function to check if a move is valid
 def is_valid_move(player, from_pos, to_pos):
@@ -145,102 +214,102 @@ def is_valid_move(player, from_pos, to_pos):
 
     # Check if from and to positions are within the board
     if not all(0 <= i < nx for i in [fx, tx]) or not all(0 <= i < ny for i in [fy, ty]) or not all(0 <= i < nz for i in [fz, tz]):
-        return False, "Positions out of bounds."
+        return False, move_errors[MOVE_OUT_OF_BOUNDS]
+
+    result = check_move(player_codes[player], cell_code(board[fx, fy, fz]),
+                        cell_code(board[tx, ty, tz]), fx, fy, fz, tx, ty, tz)
+    return result == MOVE_OK, move_errors[result]
 
-    # Check if there is a piece at from_pos
-    piece = board[fx, fy, fz]
-    if piece.strip() == '' or piece[0] != player:
-        return False, "No valid piece at the source position."
+# Move rules on integer codes only, so the kernel stays free of string handling
+def check_move(player_code, piece_code, dest_code, fx, fy, fz, tx, ty, tz):
+    # Check if there is a piece of the player's at from_pos
+    if piece_code >> 4 != player_code:
+        return MOVE_NO_PIECE
 
     # Check if the destination is occupied by the player's own piece
-    dest_piece = board[tx, ty, tz]
-    if dest_piece.strip() != '' and dest_piece[0] == player:
-        return False, "Cannot capture your own piece."
+    if dest_code >> 4 == player_code:
+        return MOVE_OWN_CAPTURE
 
     # Determine movement rules based on piece type
-    piece_type = piece[1]
+    piece_type = piece_code & 0xF
     dx = tx - fx
     dy = ty - fy
     dz = tz - fz
+    adx = abs(dx)
+    ady = abs(dy)
+    adz = abs(dz)
 
     # Check if movement is in one plane (only two axes can change)
-    planes_moved = sum([dx != 0, dy != 0, dz != 0])
-    if planes_moved > 2:
-        return False, "Pieces can only move in one plane."
+    if dx != 0 and dy != 0 and dz != 0:
+        return MOVE_OFF_PLANE
 
     # Movement logic for each piece
-    if piece_type == 'P':  # Pawn
-        direction = 1 if player == 'W' else -1
+    if piece_type == 6:  # Pawn
+        direction = 1 if player_code == 1 else -1
         # Forward move without capture
-        if dx == direction and dy == 0 and dz == 0 and dest_piece.strip() == '':
-            return True, ""
+        if dx == direction and dy == 0 and dz == 0 and dest_code == 0:
+            return MOVE_OK
         # Diagonal capture in any one direction
-        elif dx == direction and ((abs(dy) == 1 and dz == 0) or (dy == 0 and abs(dz) == 1)) and \
-             dest_piece.strip() != '' and dest_piece[0] != player:
-            return True, ""
+        elif dx == direction and ady + adz == 1 and dest_code != 0:
+            return MOVE_OK
         else:
-            return False, "Invalid pawn move."
-    elif piece_type == 'R':  # Rook
-        if not ((dx == 0 and dy == 0 and dz != 0) or
-                (dx == 0 and dy != 0 and dz == 0) or
-                (dx != 0 and dy == 0 and dz == 0)):
-            return False, "Invalid rook move."
+            return MOVE_BAD_PAWN
+    elif piece_type == 3:  # Rook
+        # Exactly one axis changes (a second would make this a bishop move)
+        if (dx != 0) + (dy != 0) + (dz != 0) != 1:
+            return MOVE_BAD_ROOK
         # Check for obstacles
-        if not is_clear_path(from_pos, to_pos):
-            return False, "Path is not clear."
-        return True, ""
-    elif piece_type == 'B':  # Bishop
-        if not ((abs(dx) == abs(dy) and dz == 0) or
-                (abs(dx) == abs(dz) and dy == 0) or
-                (abs(dy) == abs(dz) and dx == 0)):
-            return False, "Invalid bishop move."
-        if not is_clear_path(from_pos, to_pos):
-            return False, "Path is not clear."
-        return True, ""
-    elif piece_type == 'N':  # Knight
-        moves = [
-            (2, 1, 0), (1, 2, 0), (2, 0, 1), (1, 0, 2),
-            (0, 2, 1), (0, 1, 2)
-        ]
-        if (abs(dx), abs(dy), abs(dz)) not in moves:
-            return False, "Invalid knight move."
-        return True, ""
-    elif piece_type == 'Q':  # Queen
+        if not is_clear_path((fx, fy, fz), (tx, ty, tz)):
+            return MOVE_BLOCKED
+        return MOVE_OK
+    elif piece_type == 4:  # Bishop
+        if not ((adx == ady and dz == 0) or
+                (adx == adz and dy == 0) or
+                (ady == adz and dx == 0)):
+            return MOVE_BAD_BISHOP
+        if not is_clear_path((fx, fy, fz), (tx, ty, tz)):
+            return MOVE_BLOCKED
+        return MOVE_OK
+    elif piece_type == 5:  # Knight
+        if (adx, ady, adz) not in _KNIGHT_DELTA_ABS:
+            return MOVE_BAD_KNIGHT
+        return MOVE_OK
+    elif piece_type == 2:  # Queen
         # Combines Rook and Bishop moves
-        valid_rook_move = ((dx == 0 and dy == 0 and dz != 0) or
-                           (dx == 0 and dy != 0 and dz == 0) or
-                           (dx != 0 and dy == 0 and dz == 0))
-        valid_bishop_move = ((abs(dx) == abs(dy) and dz == 0) or
-                             (abs(dx) == abs(dz) and dy == 0) or
-                             (abs(dy) == abs(dz) and dx == 0))
+        valid_rook_move = (dx != 0) + (dy != 0) + (dz != 0) == 1
+        valid_bishop_move = ((adx == ady and dz == 0) or
+                             (adx == adz and dy == 0) or
+                             (ady == adz and dx == 0))
         if not (valid_rook_move or valid_bishop_move):
-            return False, "Invalid queen move."
-        if not is_clear_path(from_pos, to_pos):
-            return False, "Path is not clear."
-        return True, ""
-    elif piece_type == 'K':  # King
-        if max(abs(dx), abs(dy), abs(dz)) != 1:
-            return False, "Invalid king move."
-        return True, ""
+            return MOVE_BAD_QUEEN
+        if not is_clear_path((fx, fy, fz), (tx, ty, tz)):
+            return MOVE_BLOCKED
+        return MOVE_OK
+    elif piece_type == 1:  # King
+        # The magnitudes are non-negative, so their OR is 1 exactly when each
+        # is 0 or 1 and at least one is 1
+        if adx | ady | adz != 1:
+            return MOVE_BAD_KING
+        return MOVE_OK
     else:
-        return False, "Unknown piece type."
+        return MOVE_UNKNOWN_PIECE
 
 # Function to check if the path between from_pos and to_pos is clear
 def is_clear_path(from_pos, to_pos):
     fx, fy, fz = from_pos
     tx, ty, tz = to_pos
-    dx = np.sign(tx - fx)
-    dy = np.sign(ty - fy)
-    dz = np.sign(tz - fz)
-
-    x, y, z = fx + dx, fy + dy, fz + dz
-    while (x, y, z) != (tx, ty, tz):
-        if board[x, y, z].strip() != '':
-            return False
-        x += dx if dx != 0 else 0
-        y += dy if dy != 0 else 0
-        z += dz if dz != 0 else 0
-    return True
+    dx = (tx > fx) - (tx < fx)
+    dy = (ty > fy) - (ty < fy)
+    dz = (tz > fz) - (tz < fz)
+
+    # Read all intermediate cells with a single fancy-index gather
+    steps = max(abs(tx - fx), abs(ty - fy), abs(tz - fz)) - 1
+    if steps <= 0:
+        return True
+    offsets = ray_offsets[:steps]
+    cells = board[fx + offsets * dx, fy + offsets * dy, fz + offsets * dz]
+    # Through the code table, so blank cells of any width count as empty like in check_move
+    return not any(cell_code(cell) for cell in cells)
 
 # Function to make a move
 def make_move(player):
@@ -257,9 +326,9 @@ def make_move(player):
             if valid:
                 fx, fy, fz = from_pos
                 tx, ty, tz = to_pos
-                dest_piece = board[tx, ty, tz]
-                # Check if capturing a king
-                if dest_piece.strip() != '' and dest_piece[1] == 'K' and dest_piece[0] != player:
+                dest_code = cell_code(board[tx, ty, tz])
+                # Check if capturing a king (own pieces were ruled out above)
+                if dest_code & 0xF == piece_codes['K']:
                     print(f"{player} captured a king!")
                 # Move the piece
                 board[tx, ty, tz] = board[fx, fy, fz]
@@ -273,14 +342,8 @@ def make_move(player):
 
 # Function to check for game over condition
 def is_game_over(opponent):
-    kings = 0
-    for x in range(nx):
-        for y in range(ny):
-            for z in range(nz):
-                piece = board[x, y, z]
-                if piece == opponent + 'K':
-                    kings += 1
-    return kings < 2
+    kings = np.count_nonzero(board == opponent + 'K')
+    return bool(kings < 2)
 
 # Main game loop
 def play_game():
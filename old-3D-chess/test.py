@@ -126,6 +126,13 @@ def run_tests():
     # Test that rook can capture
     assert is_valid_move('W', (0, 0, 0), (0, 3, 0))[0], "Rook capturing failed"
 
+    # Test unknown piece types
+    print("Testing unknown pieces...")
+    initialize_board()
+    board.fill('  ')  # Clear the board
+    board[0, 0, 0] = 'WX'  # Not a piece type the rules know
+    assert is_valid_move('W', (0, 0, 0), (1, 0, 0)) == (False, "Unknown piece type."), "Unknown piece not rejected"
+
     # Test checkmate detection
     print("Testing checkmate detection...")
     initialize_board()
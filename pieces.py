@@ -1,11 +1,9 @@
 # pieces.py
 """Module containing the Piece classes for the 3D chess game."""
 
-import logging
 from abc import ABC, abstractmethod
-from typing import Tuple, TYPE_CHECKING
-
-from utils import is_clear_path
+import logging
+from typing import Callable, Dict, List, Set, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from board import Board
@@ -13,9 +11,168 @@ if TYPE_CHECKING:
 Position = Tuple[int, int, int]
 logger = logging.getLogger(__name__)
 
+# Mailbox byte layout: low nibble is the piece type, high nibble the color.
+PIECE_CODES = {'P': 1, 'R': 2, 'N': 3, 'B': 4, 'Q': 5, 'K': 6}
+COLOR_CODES = {'W': 0, 'B': 1}
+OPPONENT = {'W': 'B', 'B': 'W'}
+# Pawns advance towards increasing x for white and decreasing x for black.
+PAWN_DIRECTIONS = {'W': 1, 'B': -1}
+
+# Sliding piece kinds, as bits of the direction table entries below
+_ROOK_LINES = 1
+_BISHOP_LINES = 2
+
+# One entry per step direction (sx, sy, sz) with each component in {-1, 0, 1},
+# indexed by (sx + 1) * 9 + (sy + 1) * 3 + (sz + 1). The low bits tell which
+# sliding kinds may move that way; the value above them counts the moving axes.
+_DIRECTIONS = bytes(
+    (moving << 2) | (_ROOK_LINES if moving == 1 else _BISHOP_LINES if moving else 0)
+    for moving in (
+        (sx != 0) + (sy != 0) + (sz != 0)
+        for sx in (-1, 0, 1) for sy in (-1, 0, 1) for sz in (-1, 0, 1)
+    )
+)
+
+
+def _pawn_move(board: 'Board', color: str, from_idx: int, to_idx: int,
+               fx: int, fy: int, fz: int, tx: int, ty: int, tz: int) -> bool:
+    """Checks a pawn move given as flat square indices and integer coordinates."""
+    direction = PAWN_DIRECTIONS[color]
+    dx = tx - fx
+    dy = ty - fy
+    dz = tz - fz
+
+    to_bit = 1 << to_idx
+    occupancy = board._occupancy
+
+    # Forward move
+    if dx == direction and dy == 0 and dz == 0 and not (occupancy['W'] | occupancy['B']) & to_bit:
+        return True
+    # Diagonal capture
+    elif dx == direction and (dy == 1 or dy == -1) and dz == 0:
+        if occupancy[OPPONENT[color]] & to_bit:
+            return True
+        else:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Pawn cannot capture own piece or empty square at %s", (tx, ty, tz))
+            return False
+    else:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Invalid pawn move from %s to %s", (fx, fy, fz), (tx, ty, tz))
+        return False
+
+
+def _slider_rule(kind: int, name: str) -> Callable[..., bool]:
+    """
+    Builds the move rule of a sliding piece.
+
+    :param kind: The piece's bits in the direction table.
+    :param name: The piece name used in log messages.
+    :return: A rule with the same signature as the other move kernels.
+    """
+    def rule(board: 'Board', color: str, from_idx: int, to_idx: int,
+             fx: int, fy: int, fz: int, tx: int, ty: int, tz: int) -> bool:
+        dx = tx - fx
+        dy = ty - fy
+        dz = tz - fz
+        sx = (dx > 0) - (dx < 0)
+        sy = (dy > 0) - (dy < 0)
+        sz = (dz > 0) - (dz < 0)
+        steps = max(dx * sx, dy * sy, dz * sz)
+        entry = _DIRECTIONS[(sx + 1) * 9 + (sy + 1) * 3 + sz + 1]
+
+        # The direction must suit the piece, and every moving axis must move
+        # the full distance, so the magnitudes sum to steps per moving axis
+        if entry & kind and dx * sx + dy * sy + dz * sz == steps * (entry >> 2):
+            # Both ends are on the board, so the precomputed mask of the
+            # squares in between tells with one AND whether anything blocks
+            occupancy = board._occupancy
+            if not (occupancy['W'] | occupancy['B']) & board._between[from_idx][to_idx]:
+                if not occupancy[color] & 1 << to_idx:
+                    return True
+                else:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("%s cannot capture own piece at %s", name.capitalize(), (tx, ty, tz))
+                    return False
+            else:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Path is not clear for %s from %s to %s", name, (fx, fy, fz), (tx, ty, tz))
+                return False
+        else:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Invalid %s move from %s to %s", name, (fx, fy, fz), (tx, ty, tz))
+            return False
+
+    rule.__name__ = f"_{name}_move"
+    rule.__doc__ = f"Checks a {name} move given as flat square indices and integer coordinates."
+    return rule
+
+
+_rook_move = _slider_rule(_ROOK_LINES, 'rook')
+_bishop_move = _slider_rule(_BISHOP_LINES, 'bishop')
+# Queen moves like Rook or Bishop
+_queen_move = _slider_rule(_ROOK_LINES | _BISHOP_LINES, 'queen')
+
+
+def _knight_move(board: 'Board', color: str, from_idx: int, to_idx: int,
+                 fx: int, fy: int, fz: int, tx: int, ty: int, tz: int) -> bool:
+    """Checks a knight move given as flat square indices and integer coordinates."""
+    to_bit = 1 << to_idx
+
+    # One AND against the precomputed knight destinations of this square
+    if board._knight_attacks[from_idx] & to_bit:
+        if not board._occupancy[color] & to_bit:
+            return True
+        else:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Knight cannot capture own piece at %s", (tx, ty, tz))
+            return False
+    else:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Invalid knight move from %s to %s", (fx, fy, fz), (tx, ty, tz))
+        return False
+
+
+def _king_move(board: 'Board', color: str, from_idx: int, to_idx: int,
+               fx: int, fy: int, fz: int, tx: int, ty: int, tz: int) -> bool:
+    """Checks a king move given as flat square indices and integer coordinates."""
+    to_bit = 1 << to_idx
+
+    # King moves one square in any direction
+    if board._king_attacks[from_idx] & to_bit:
+        if not board._occupancy[color] & to_bit:
+            # Note: Additional checks for check situations can be added here
+            return True
+        else:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("King cannot capture own piece at %s", (tx, ty, tz))
+            return False
+    else:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Invalid king move from %s to %s", (fx, fy, fz), (tx, ty, tz))
+        return False
+
 
 class Piece(ABC):
-    """Abstract base class for all chess pieces."""
+    """Base class for all chess pieces."""
+
+    __slots__ = ('color', 'position')
+
+    symbol = ''
+
+    @staticmethod
+    @abstractmethod
+    def _validator(board: 'Board', color: str, from_idx: int, to_idx: int,
+                   fx: int, fy: int, fz: int, tx: int, ty: int, tz: int) -> bool:
+        """
+        Move rule of the piece type, set by each subclass to one of the module-level rules.
+
+        :param board: The game board.
+        :param color: The moving piece's color.
+        :param from_idx: Flat index of the starting square.
+        :param to_idx: Flat index of the destination square.
+        :return: True if the move is valid according to the piece's movement rules, False otherwise.
+        """
 
     def __init__(self, color: str, position: Position):
         """
@@ -29,36 +186,25 @@ class Piece(ABC):
 
     def is_valid_move(self, to_position: Position, board: 'Board') -> bool:
         """
-        Checks if a move is valid by performing general checks and calling the piece-specific method.
+        Checks if a move is valid by performing general checks and calling the piece-specific rule.
 
         :param to_position: The destination position.
         :param board: The game board.
         :return: True if the move is valid, False otherwise.
         """
         if not board.is_within_bounds(to_position):
-            logger.debug(f"Destination {to_position} is out of bounds.")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Destination %s is out of bounds.", to_position)
             return False
 
-        if self.position == to_position:
-            logger.debug("Destination is the same as the current position.")
+        from_idx = board._encode(*self.position)
+        to_idx = board._encode(*to_position)
+        if from_idx == to_idx:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Destination is the same as the current position.")
             return False
 
-        try:
-            return self._is_valid_move(to_position, board)
-        except Exception as e:
-            logger.error(f"Error in move validation for {self.__class__.__name__}: {e}")
-            return False
-
-    @abstractmethod
-    def _is_valid_move(self, to_position: Position, board: 'Board') -> bool:
-        """
-        Abstract method to be implemented by each piece type for move validation.
-
-        :param to_position: The destination position.
-        :param board: The game board.
-        :return: True if the move is valid according to the piece's movement rules, False otherwise.
-        """
-        pass
+        return self._validator(board, self.color, from_idx, to_idx, *self.position, *to_position)
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.color}, {self.position})"
@@ -67,174 +213,75 @@ class Piece(ABC):
 class Pawn(Piece):
     """Class representing a Pawn."""
 
-    def _is_valid_move(self, to_position: Position, board: 'Board') -> bool:
-        """Checks if the pawn's move is valid."""
-        fx, fy, fz = self.position
-        tx, ty, tz = to_position
-
-        direction = 1 if self.color == 'W' else -1
-        dx = tx - fx
-        dy = ty - fy
-        dz = tz - fz
+    __slots__ = ()
 
-        # Forward move
-        if dx == direction and dy == 0 and dz == 0 and not board.get_piece(to_position):
-            return True
-        # Diagonal capture
-        elif dx == direction and abs(dy) == 1 and dz == 0:
-            target_piece = board.get_piece(to_position)
-            if target_piece and target_piece.color != self.color:
-                return True
-            else:
-                logger.debug(f"Pawn cannot capture own piece or empty square at {to_position}")
-                return False
-        else:
-            logger.debug(f"Invalid pawn move from {self.position} to {to_position}")
-            return False
+    symbol = 'P'
+    _validator = staticmethod(_pawn_move)
 
 
 class Rook(Piece):
     """Class representing a Rook."""
 
-    def _is_valid_move(self, to_position: Position, board: 'Board') -> bool:
-        """Checks if the rook's move is valid."""
-        fx, fy, fz = self.position
-        tx, ty, tz = to_position
-
-        # Rook moves along one axis
-        if ((fx == tx) and (fy == ty) and (fz != tz)) or \
-           ((fx == tx) and (fy != ty) and (fz == tz)) or \
-           ((fx != tx) and (fy == ty) and (fz == tz)):
-            if is_clear_path(board, self.position, to_position):
-                target_piece = board.get_piece(to_position)
-                if not target_piece or target_piece.color != self.color:
-                    return True
-                else:
-                    logger.debug(f"Rook cannot capture own piece at {to_position}")
-                    return False
-            else:
-                logger.debug(f"Path is not clear for rook from {self.position} to {to_position}")
-                return False
-        else:
-            logger.debug(f"Invalid rook move from {self.position} to {to_position}")
-            return False
+    __slots__ = ()
+
+    symbol = 'R'
+    _validator = staticmethod(_rook_move)
 
 
 class Knight(Piece):
     """Class representing a Knight."""
 
-    def _is_valid_move(self, to_position: Position, board: 'Board') -> bool:
-        """Checks if the knight's move is valid."""
-        fx, fy, fz = self.position
-        tx, ty, tz = to_position
-        dx = abs(tx - fx)
-        dy = abs(ty - fy)
-        dz = abs(tz - fz)
-
-        # The sum of the squares of the movement along each axis equals 5
-        if dx**2 + dy**2 + dz**2 == 5:
-            target_piece = board.get_piece(to_position)
-            if not target_piece or target_piece.color != self.color:
-                return True
-            else:
-                logger.debug(f"Knight cannot capture own piece at {to_position}")
-                return False
-        else:
-            logger.debug(f"Invalid knight move from {self.position} to {to_position}")
-            return False
+    __slots__ = ()
+
+    symbol = 'N'
+    _validator = staticmethod(_knight_move)
 
 
 class Bishop(Piece):
     """Class representing a Bishop."""
 
-    def _is_valid_move(self, to_position: Position, board: 'Board') -> bool:
-        """Checks if the bishop's move is valid."""
-        fx, fy, fz = self.position
-        tx, ty, tz = to_position
-        dx = tx - fx
-        dy = ty - fy
-        dz = tz - fz
+    __slots__ = ()
 
-        # Bishop moves along diagonals
-        if (abs(dx) == abs(dy) == abs(dz) != 0) or \
-           (abs(dx) == abs(dy) != 0 and dz == 0) or \
-           (abs(dx) == abs(dz) != 0 and dy == 0) or \
-           (abs(dy) == abs(dz) != 0 and dx == 0):
-            if is_clear_path(board, self.position, to_position):
-                target_piece = board.get_piece(to_position)
-                if not target_piece or target_piece.color != self.color:
-                    return True
-                else:
-                    logger.debug(f"Bishop cannot capture own piece at {to_position}")
-                    return False
-            else:
-                logger.debug(f"Path is not clear for bishop from {self.position} to {to_position}")
-                return False
-        else:
-            logger.debug(f"Invalid bishop move from {self.position} to {to_position}")
-            return False
+    symbol = 'B'
+    _validator = staticmethod(_bishop_move)
 
 
 class Queen(Piece):
     """Class representing a Queen."""
 
-    def _is_valid_move(self, to_position: Position, board: 'Board') -> bool:
-        """Checks if the queen's move is valid."""
-        fx, fy, fz = self.position
-        tx, ty, tz = to_position
-        dx = tx - fx
-        dy = ty - fy
-        dz = tz - fz
+    __slots__ = ()
 
-        # Queen moves like Rook or Bishop
-        if ((fx == tx) or (fy == ty) or (fz == tz)) or \
-           (abs(dx) == abs(dy) == abs(dz) != 0) or \
-           (abs(dx) == abs(dy) != 0 and dz == 0) or \
-           (abs(dx) == abs(dz) != 0 and dy == 0) or \
-           (abs(dy) == abs(dz) != 0 and dx == 0):
-            if is_clear_path(board, self.position, to_position):
-                target_piece = board.get_piece(to_position)
-                if not target_piece or target_piece.color != self.color:
-                    return True
-                else:
-                    logger.debug(f"Queen cannot capture own piece at {to_position}")
-                    return False
-            else:
-                logger.debug(f"Path is not clear for queen from {self.position} to {to_position}")
-                return False
-        else:
-            logger.debug(f"Invalid queen move from {self.position} to {to_position}")
-            return False
+    symbol = 'Q'
+    _validator = staticmethod(_queen_move)
 
 
 class King(Piece):
     """Class representing a King."""
 
-    def _is_valid_move(self, to_position: Position, board: 'Board') -> bool:
-        """Checks if the king's move is valid."""
-        fx, fy, fz = self.position
-        tx, ty, tz = to_position
-        dx = abs(tx - fx)
-        dy = abs(ty - fy)
-        dz = abs(tz - fz)
-
-        # King moves one square in any direction
-        if max(dx, dy, dz) == 1:
-            target_piece = board.get_piece(to_position)
-            if not target_piece or target_piece.color != self.color:
-                # Note: Additional checks for check situations can be added here
-                return True
-            else:
-                logger.debug(f"King cannot capture own piece at {to_position}")
-                return False
-        else:
-            logger.debug(f"Invalid king move from {self.position} to {to_position}")
-            return False
+    __slots__ = ()
+
+    symbol = 'K'
+    _validator = staticmethod(_king_move)
 
 
 class PieceFactory:
     """Factory class to create chess pieces."""
 
+    _PIECE_CLASSES = {
+        'P': Pawn,
+        'R': Rook,
+        'N': Knight,
+        'B': Bishop,
+        'Q': Queen,
+        'K': King,
+    }
+
+    def __init__(self):
+        """Initializes the factory with an empty pool of released pieces per class."""
+        self._pools: Dict[type, List[Piece]] = {cls: [] for cls in self._PIECE_CLASSES.values()}
+        # id() of every pooled piece, so release spots a double release without scanning
+        self._pooled: Set[int] = set()
+
     def create_piece(self, piece_type: str, color: str, position: Position) -> Piece:
         """
         Creates a chess piece of the given type, color, and position.
@@ -245,19 +292,40 @@ class PieceFactory:
         :return: An instance of a Piece subclass.
         :raises ValueError: If the piece type is invalid.
         """
-        piece_classes = {
-            'P': Pawn,
-            'R': Rook,
-            'N': Knight,
-            'B': Bishop,
-            'Q': Queen,
-            'K': King,
-        }
-        piece_class = piece_classes.get(piece_type)
+        piece_class = self._PIECE_CLASSES.get(piece_type)
         if piece_class:
-            piece = piece_class(color, position)
-            logger.debug(f"Created {piece} at {position}")
+            pool = self._pools[piece_class]
+            if pool:
+                piece = pool.pop()
+                self._pooled.discard(id(piece))
+                piece.color = color
+                piece.position = position
+            else:
+                piece = piece_class(color, position)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Created %s at %s", piece, position)
             return piece
         else:
-            logger.error(f"Unknown piece type: {piece_type}")
+            logger.error("Unknown piece type: %s", piece_type)
             raise ValueError(f"Unknown piece type: {piece_type}")
+
+    def release(self, piece: Piece) -> None:
+        """
+        Returns a piece that is no longer on any board, so create_piece can reuse it.
+
+        A captured piece must be removed from the board before it is released,
+        or a later create_piece would put the same object on two squares.
+
+        :param piece: The piece to recycle; the caller must not use it afterwards.
+        :raises ValueError: If the piece has already been released, or the factory
+                            does not create pieces of its class.
+        """
+        pool = self._pools.get(type(piece))
+        if pool is None:
+            logger.error("Unknown piece class: %s", type(piece).__name__)
+            raise ValueError(f"Unknown piece class: {type(piece).__name__}")
+        if id(piece) in self._pooled:
+            logger.error("Piece already released: %s", piece)
+            raise ValueError(f"Piece already released: {piece}")
+        self._pooled.add(id(piece))
+        pool.append(piece)
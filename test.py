@@ -4,8 +4,9 @@
 import unittest
 import logging
 from board import Board
-from pieces import PieceFactory, Pawn, Rook, Knight, Bishop, Queen, King
-from utils import is_clear_path
+from pieces import PieceFactory, Piece, Pawn, Rook, Knight, Bishop, Queen, King
+from utils import check_ray, is_clear_path, is_clear_path_many, parse_move, parse_moves
+from itertools import product
 from typing import Tuple
 
 Position = Tuple[int, int, int]
@@ -18,8 +19,7 @@ class TestChess3D(unittest.TestCase):
     def setUp(self):
         """Sets up the test environment before each test."""
         self.board = Board()
-        self.board._board.fill(None)
-        self.board._pieces.clear()
+        self.board.clear()
         self.piece_factory = PieceFactory()
 
     # ---------------------------
@@ -322,7 +322,7 @@ class TestChess3D(unittest.TestCase):
     def test_is_clear_path(self):
         """Tests the is_clear_path function."""
         # Set up the board with a clear path
-        self.board._pieces.clear()  # Clear the board
+        self.board.clear()  # Clear the board
         self.board.set_piece((0, 0, 0), self.piece_factory.create_piece('R', 'W', (0, 0, 0)))
         self.assertTrue(is_clear_path(self.board, (0, 0, 0), (0, 3, 0)))
 
@@ -333,7 +333,7 @@ class TestChess3D(unittest.TestCase):
     def test_is_clear_path_diagonal(self):
         """Tests is_clear_path on a diagonal path."""
         # Set up the board with a clear diagonal path
-        self.board._pieces.clear()
+        self.board.clear()
         self.board.set_piece((0, 0, 0), self.piece_factory.create_piece('B', 'W', (0, 0, 0)))
         self.assertTrue(is_clear_path(self.board, (0, 0, 0), (3, 3, 3)))
 
@@ -343,8 +343,35 @@ class TestChess3D(unittest.TestCase):
 
     def test_is_clear_path_invalid_movement(self):
         """Tests is_clear_path with invalid movement pattern."""
-        self.board._pieces.clear()
+        self.board.clear()
         self.assertFalse(is_clear_path(self.board, (0, 0, 0), (2, 1, 0)))  # Not a straight line or diagonal
+        self.assertFalse(is_clear_path(self.board, (0, 0, 0), (0, 0, -1)))  # Destination off the board
+
+    def test_check_ray(self):
+        """Tests that check_ray reports the piece at the end of the path."""
+        target = self.piece_factory.create_piece('P', 'B', (0, 3, 0))
+        self.board.set_piece((0, 3, 0), target)
+        self.assertEqual(check_ray(self.board, (0, 0, 0), (0, 3, 0)), (True, target))
+        self.assertEqual(check_ray(self.board, (0, 0, 0), (0, 2, 0)), (True, None))
+
+        # Blocked midway still names the piece at the destination
+        self.board.set_piece((0, 1, 0), self.piece_factory.create_piece('P', 'W', (0, 1, 0)))
+        self.assertEqual(check_ray(self.board, (0, 0, 0), (0, 3, 0)), (False, target))
+
+    def test_is_clear_path_many(self):
+        """Tests that batch path checks agree with is_clear_path, including off-board destinations."""
+        for position in ((2, 1, 1), (1, 2, 2), (4, 1, 3)):
+            self.board.set_piece(position, self.piece_factory.create_piece('P', 'B', position))
+        targets = list(product(range(-2, self.board._nx + 2), range(-1, self.board._ny + 1), range(self.board._nz)))
+        expected = [is_clear_path(self.board, (1, 1, 1), target) for target in targets]
+        self.assertEqual(is_clear_path_many(self.board, (1, 1, 1), targets).tolist(), expected)
+        self.assertEqual(is_clear_path_many(self.board, (1, 1, 1), []).shape, (0,))
+
+        # One origin per path
+        origins = [(1, 1, 1), (0, 0, 0), (0, 0, 3), (5, 1, 3), (7, 3, 3)]
+        ends = [(3, 1, 1), (3, 3, 3), (0, 3, 3), (2, 1, 3), (7, 0, 0)]
+        expected = [is_clear_path(self.board, origin, end) for origin, end in zip(origins, ends)]
+        self.assertEqual(is_clear_path_many(self.board, origins, ends).tolist(), expected)
 
     # ---------------------------
     # Tests for is_game_over Method
@@ -352,7 +379,7 @@ class TestChess3D(unittest.TestCase):
     def test_is_game_over(self):
         """Tests the is_game_over method."""
         # Set up a scenario where the opponent has no kings left
-        self.board._pieces.clear()  # Clear the board
+        self.board.clear()  # Clear the board
         # Place a single king for player 'W'
         king_position = (0, 0, 0)
         king = self.piece_factory.create_piece('K', 'W', king_position)
@@ -370,7 +397,7 @@ class TestChess3D(unittest.TestCase):
 
     def test_is_game_over_multiple_kings(self):
         """Tests is_game_over with multiple kings."""
-        self.board._pieces.clear()
+        self.board.clear()
         # Place two kings for 'B'
         king1 = self.piece_factory.create_piece('K', 'B', (7, 3, 3))
         king2 = self.piece_factory.create_piece('K', 'B', (7, 2, 2))
@@ -385,6 +412,17 @@ class TestChess3D(unittest.TestCase):
         self.board.set_piece((7, 2, 2), None)
         self.assertTrue(self.board.is_game_over('B'))
 
+    def test_is_game_over_after_king_capture(self):
+        """Tests that capturing the last king through move_piece ends the game."""
+        rook = self.piece_factory.create_piece('R', 'W', (0, 0, 0))
+        king = self.piece_factory.create_piece('K', 'B', (0, 0, 3))
+        self.board.set_piece((0, 0, 0), rook)
+        self.board.set_piece((0, 0, 3), king)
+        self.assertFalse(self.board.is_game_over('B'))
+
+        self.assertTrue(self.board.move_piece((0, 0, 0), (0, 0, 3)))
+        self.assertTrue(self.board.is_game_over('B'))
+
     # ---------------------------
     # Additional Tests
     # ---------------------------
@@ -433,6 +471,66 @@ class TestChess3D(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.piece_factory.create_piece('X', 'W', (0, 0, 0))
 
+    def test_piece_requires_move_rule(self):
+        """Tests that only piece classes with a move rule can be instantiated."""
+        with self.assertRaises(TypeError):
+            Piece('W', (0, 0, 0))
+
+        class Shapeless(Piece):
+            __slots__ = ()
+
+        with self.assertRaises(TypeError):
+            Shapeless('W', (0, 0, 0))
+
+    def test_piece_factory_reuses_released_pieces(self):
+        """Tests that a released piece is handed out again with its new color and position."""
+        rook = self.piece_factory.create_piece('R', 'W', (0, 0, 0))
+        self.piece_factory.release(rook)
+
+        reused = self.piece_factory.create_piece('R', 'B', (7, 3, 3))
+        self.assertIs(reused, rook)
+        self.assertEqual((reused.color, reused.position), ('B', (7, 3, 3)))
+        self.assertIsNot(self.piece_factory.create_piece('R', 'W', (0, 0, 0)), rook)
+
+    def test_piece_factory_rejects_double_release(self):
+        """Tests that releasing a pooled piece again raises instead of pooling it twice."""
+        knight = self.piece_factory.create_piece('N', 'W', (0, 1, 0))
+        self.piece_factory.release(knight)
+        with self.assertRaises(ValueError):
+            self.piece_factory.release(knight)
+
+        # Only one handout of the released knight
+        self.assertIs(self.piece_factory.create_piece('N', 'B', (7, 1, 0)), knight)
+        self.assertIsNot(self.piece_factory.create_piece('N', 'B', (7, 2, 0)), knight)
+
+        # A handed-out piece can be released again, but not a class the factory does not make
+        self.piece_factory.release(knight)
+
+        class Archer(Knight):
+            __slots__ = ()
+
+        with self.assertRaises(ValueError):
+            self.piece_factory.release(Archer('W', (0, 0, 0)))
+
+    def test_parse_move(self):
+        """Tests parsing of a single x,y,z move string."""
+        self.assertEqual(parse_move(' 1, 2 ,3 '), (1, 2, 3))
+        for bad in ('1,2', '1,2,3,4', 'a,b,c', ''):
+            with self.assertRaises(ValueError):
+                parse_move(bad)
+
+    def test_parse_moves(self):
+        """Tests parsing a batch of move strings into an array."""
+        moves = parse_moves(['0,1,2', '7,3,3'])
+        self.assertEqual(moves.tolist(), [[0, 1, 2], [7, 3, 3]])
+        self.assertEqual(parse_moves([]).shape, (0, 3))
+        with self.assertRaises(ValueError):
+            parse_moves(['1,2', '3,4', '5,6'])
+        # Blank lines and comments are rejected like in parse_move, not skipped
+        for bad in (['1,2,3', '', '4,5,6'], ['1,2,3 # x'], ['#1,2,3']):
+            with self.assertRaises(ValueError):
+                parse_moves(bad)
+
     def test_is_within_bounds(self):
         """Tests the is_within_bounds method of the Board."""
         self.assertTrue(self.board.is_within_bounds((0, 0, 0)))
@@ -441,6 +539,17 @@ class TestChess3D(unittest.TestCase):
         self.assertFalse(self.board.is_within_bounds((0, self.board._ny, 0)))
         self.assertFalse(self.board.is_within_bounds((0, 0, self.board._nz)))
 
+    def test_specialized_board(self):
+        """Tests that a specialized board matches the generic one."""
+        specialized_cls = Board.specialize(8, 4, 4)
+        self.assertIs(specialized_cls, Board.specialize(8, 4, 4))
+
+        board = specialized_cls()
+        self.assertIsInstance(board, Board)
+        for position in [(0, 0, 0), (7, 3, 3), (-1, 0, 0), (8, 0, 0), (0, 4, 0), (0, 0, 4)]:
+            self.assertEqual(board.is_within_bounds(position), self.board.is_within_bounds(position))
+        self.assertEqual(board._encode(5, 2, 1), self.board._encode(5, 2, 1))
+
     def test_set_piece_out_of_bounds(self):
         """Tests setting a piece out of bounds."""
         pawn = self.piece_factory.create_piece('P', 'W', (0, 0, 0))
@@ -449,6 +558,97 @@ class TestChess3D(unittest.TestCase):
         self.assertIn('Attempted to set piece at out-of-bounds position', ''.join(cm.output))
 
 
+    def test_mailbox_tracks_pieces(self):
+        """Tests that the mailbox mirrors placements and removals."""
+        idx = self.board._encode(2, 1, 3)
+        self.assertFalse(self.board.occupied(idx))
+
+        queen = self.piece_factory.create_piece('Q', 'B', (2, 1, 3))
+        self.board.set_piece((2, 1, 3), queen)
+        self.assertTrue(self.board.occupied(idx))
+        self.assertEqual(self.board.color_of(idx), 1)
+
+        self.board.set_piece((2, 1, 3), None)
+        self.assertFalse(self.board.occupied(idx))
+
+    def test_get_piece_by_index(self):
+        """Tests that get_piece accepts flat indices and rejects out-of-bounds tuples."""
+        knight = self.piece_factory.create_piece('N', 'W', (0, 1, 0))
+        self.board.set_piece((0, 1, 0), knight)
+
+        idx = self.board._encode(0, 1, 0)
+        self.assertEqual(self.board._decode(idx), (0, 1, 0))
+        self.assertIs(self.board._decode(idx), self.board._decode(idx))
+        self.assertIs(self.board.get_piece(idx), knight)
+        # (0, 0, 4) would alias (0, 1, 0) if it were encoded unchecked
+        self.assertIsNone(self.board.get_piece((0, 0, 4)))
+
+    def test_clone_is_independent(self):
+        """Tests that moves on a cloned board do not affect the original."""
+        rook = self.piece_factory.create_piece('R', 'W', (0, 0, 0))
+        self.board.set_piece((0, 0, 0), rook)
+
+        clone = self.board.clone()
+        self.assertTrue(clone.move_piece((0, 0, 0), (0, 3, 0)))
+        # Moved pieces hold the board's shared position tuple
+        self.assertIs(clone.get_piece((0, 3, 0)).position, clone._decode(clone._encode(0, 3, 0)))
+
+        self.assertIs(self.board.get_piece((0, 0, 0)), rook)
+        self.assertEqual(rook.position, (0, 0, 0))
+        self.assertIsNone(self.board.get_piece((0, 3, 0)))
+        self.assertFalse(self.board.occupied(self.board._encode(0, 3, 0)))
+        self.assertEqual(clone.get_piece((0, 3, 0)).position, (0, 3, 0))
+
+    def test_piece_lists_follow_moves(self):
+        """Tests that the piece lists and moved flags follow a move."""
+        rook = self.piece_factory.create_piece('R', 'W', (0, 0, 0))
+        self.board.set_piece((0, 0, 0), rook)
+        self.assertTrue(self.board.move_piece((0, 0, 0), (0, 3, 0)))
+
+        to_idx = self.board._encode(0, 3, 0)
+        self.assertEqual(self.board._bitboards[('W', 'R')], 1 << to_idx)
+        self.assertTrue(self.board._flags[to_idx])
+        self.assertFalse(self.board._flags[self.board._encode(0, 0, 0)])
+        self.assertEqual(self.board._occupancy['W'], 1 << to_idx)
+        self.assertEqual(self.board._occupancy['B'], 0)
+
+    def test_are_valid_moves(self):
+        """Tests that batch validation agrees with is_valid_move for every piece type."""
+        self.board.set_piece((2, 2, 2), self.piece_factory.create_piece('P', 'B', (2, 2, 2)))
+        self.board.set_piece((1, 1, 3), self.piece_factory.create_piece('P', 'W', (1, 1, 3)))
+        squares = list(product(range(-1, self.board._nx + 1), range(self.board._ny), range(self.board._nz)))
+        for symbol in ('P', 'R', 'N', 'B', 'Q', 'K'):
+            piece = self.piece_factory.create_piece(symbol, 'W', (1, 1, 1))
+            self.board.set_piece((1, 1, 1), piece)
+            expected = [piece.is_valid_move(square, self.board) for square in squares]
+            self.assertEqual(self.board.are_valid_moves(piece, squares).tolist(), expected, symbol)
+
+    def test_attack_masks(self):
+        """Tests the precomputed knight and king destinations of a corner square."""
+        corner = self.board._encode(0, 0, 0)
+        knight_dests = {(1, 2, 0), (2, 1, 0), (1, 0, 2), (2, 0, 1), (0, 1, 2), (0, 2, 1)}
+        king_dests = {(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)} - {(0, 0, 0)}
+        self.assertEqual(self.board._knight_attacks[corner], sum(1 << self.board._encode(*p) for p in knight_dests))
+        self.assertEqual(self.board._king_attacks[corner], sum(1 << self.board._encode(*p) for p in king_dests))
+
+    def test_between_masks(self):
+        """Tests the precomputed masks of the squares strictly between two squares."""
+        encode = self.board._encode
+        between = self.board._between[encode(0, 0, 0)]
+        self.assertEqual(between[encode(0, 0, 3)], 1 << encode(0, 0, 1) | 1 << encode(0, 0, 2))
+        self.assertEqual(between[encode(3, 3, 3)], sum(1 << encode(k, k, k) for k in (1, 2)))
+        self.assertEqual(between[encode(1, 1, 0)], 0)  # Adjacent squares
+        self.assertEqual(between[encode(2, 1, 0)], 0)  # Not on a line
+
+    def test_knight_mask_matches_rule(self):
+        """Tests that the knight masks agree with the sum-of-squares rule on every square pair."""
+        squares = list(product(range(self.board._nx), range(self.board._ny), range(self.board._nz)))
+        for f in squares:
+            mask = self.board._knight_attacks[self.board._encode(*f)]
+            for t in squares:
+                by_rule = sum((a - b) ** 2 for a, b in zip(f, t)) == 5
+                self.assertEqual(bool(mask >> self.board._encode(*t) & 1), by_rule, (f, t))
+
     def test_initialize_board(self):
         """Tests that the board initializes with the correct number of pieces."""
         self.board.initialize_board()
@@ -462,6 +662,14 @@ class TestChess3D(unittest.TestCase):
 
         self.assertEqual(total_pieces, expected_pieces)
 
+    def test_initialize_narrow_board(self):
+        """Tests that template squares off a narrow board are skipped and the rest share interned positions."""
+        board = Board(8, 2, 2)
+        for idx, piece in board._pieces.items():
+            self.assertIs(piece.position, board._decode(idx))
+        # Each color fills its 2 x 2 pawn row and back row
+        self.assertEqual(len(board._pieces), 16)
+
 
     def test_visualize(self):
         """Tests that the visualize method runs without error."""
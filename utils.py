@@ -1,30 +1,71 @@
 # utils.py
-"""Utility functions for the 3D chess game."""
+"""
+Utility functions for the 3D chess game.
 
-from typing import Tuple, TYPE_CHECKING
+The path checks accept straight lines and diagonals, where every axis
+that moves covers the same distance. Such a path between two squares on
+the board never leaves it, so only its two ends are bounds-checked.
+"""
+
+from functools import lru_cache
+from io import StringIO
+from typing import Iterable, Optional, Tuple, Union, TYPE_CHECKING
 import logging
+import re
+
+import numpy as np
 
 if TYPE_CHECKING:
     from board import Board
+    from pieces import Piece
 
 Position = Tuple[int, int, int]
 logger = logging.getLogger(__name__)
 
+_MOVE_RE = re.compile(r'\s*([-+]?\d+)\s*,\s*([-+]?\d+)\s*,\s*([-+]?\d+)\s*\Z')
+
 
+@lru_cache(maxsize=4096)
 def parse_move(move_str: str) -> Position:
     """
     Parses a move string in the format 'x,y,z' and returns a position tuple.
 
+    Results are memoized, so replaying the same strings skips the regex;
+    invalid input raises every time and is never cached.
+
     :param move_str: The move string.
     :return: A tuple (x, y, z).
     :raises ValueError: If the input format is invalid.
     """
-    try:
-        x_str, y_str, z_str = move_str.strip().split(',')
-        return int(x_str), int(y_str), int(z_str)
-    except ValueError:
+    match = _MOVE_RE.match(move_str)
+    if not match:
         logger.error("Invalid input format. Please enter coordinates as x,y,z.")
         raise ValueError("Invalid input format. Please enter coordinates as x,y,z.")
+    return int(match[1]), int(match[2]), int(match[3])
+
+
+def parse_moves(lines: Iterable[str]) -> np.ndarray:
+    """
+    Parses many 'x,y,z' strings at once, e.g. when replaying a recorded game.
+
+    :param lines: The move strings, one position each.
+    :return: An integer array of shape (n, 3).
+    :raises ValueError: If any line has an invalid format.
+    """
+    lines = list(lines)
+    if not lines:
+        return np.empty((0, 3), dtype=int)
+    # loadtxt would skip blank lines, so reject them up front to keep one row per line
+    moves = None
+    if all(line.strip() for line in lines):
+        try:
+            moves = np.loadtxt(StringIO('\n'.join(lines)), delimiter=',', dtype=int, ndmin=2, comments=None)
+        except ValueError:
+            pass
+    if moves is None or moves.shape != (len(lines), 3):
+        logger.error("Invalid input format. Please enter coordinates as x,y,z.")
+        raise ValueError("Invalid input format. Please enter coordinates as x,y,z.")
+    return moves
 
 
 def is_clear_path(board: 'Board', from_pos: Position, to_pos: Position) -> bool:
@@ -40,50 +81,93 @@ def is_clear_path(board: 'Board', from_pos: Position, to_pos: Position) -> bool:
     :param to_pos: Ending position (x, y, z).
     :return: True if the path is clear, False otherwise.
     """
-    logger.debug(f"Checking path from {from_pos} to {to_pos} for obstructions.")
-
-    try:
-        fx, fy, fz = from_pos
-        tx, ty, tz = to_pos
-        dx = tx - fx
-        dy = ty - fy
-        dz = tz - fz
-
-        steps = max(abs(dx), abs(dy), abs(dz))
-        if steps == 0:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Checking path from %s to %s for obstructions.", from_pos, to_pos)
+
+    fx, fy, fz = from_pos
+    tx, ty, tz = to_pos
+    dx = tx - fx
+    dy = ty - fy
+    dz = tz - fz
+
+    # Magnitudes and distance inline, without abs() and max() calls
+    ax = -dx if dx < 0 else dx
+    ay = -dy if dy < 0 else dy
+    az = -dz if dz < 0 else dz
+    steps = ax if ax >= ay and ax >= az else (ay if ay >= az else az)
+    if steps == 0:
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug("From position and to position are the same.")
-            return True
-
-        x_step = dx // steps if dx != 0 else 0
-        y_step = dy // steps if dy != 0 else 0
-        z_step = dz // steps if dz != 0 else 0
-
-        # Ensure the movement is along a straight line or diagonal
-        if not (
-            (dx == 0 or dy == 0 or dz == 0) or
-            (abs(dx) == abs(dy) == abs(dz) != 0) or
-            (abs(dx) == abs(dy) != 0 and dz == 0) or
-            (abs(dx) == abs(dz) != 0 and dy == 0) or
-            (abs(dy) == abs(dz) != 0 and dx == 0)
-        ):
+        return True
+
+    if (ax and ax != steps) or (ay and ay != steps) or (az and az != steps):
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Movement is not along a straight line or diagonal.")
-            return False
-
-        x, y, z = fx + x_step, fy + y_step, fz + z_step
-        for step in range(1, steps):
-            current_position = (x, y, z)
-            if not board.is_within_bounds(current_position):
-                logger.debug(f"Position {current_position} is out of bounds.")
-                return False
-            if board.get_piece(current_position):
-                logger.debug(f"Path blocked by piece at {current_position}.")
-                return False
-            x += x_step
-            y += y_step
-            z += z_step
+        return False
 
-        logger.debug("Path is clear.")
-        return True
-    except Exception as e:
-        logger.error(f"Error while checking path from {from_pos} to {to_pos}: {e}")
+    if not (board.is_within_bounds(from_pos) and board.is_within_bounds(to_pos)):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Path from %s to %s leaves the board.", from_pos, to_pos)
+        return False
+
+    # One AND of the occupancy with the precomputed squares in between
+    occupancy = board._occupancy
+    between = board._between[board._encode(fx, fy, fz)][board._encode(tx, ty, tz)]
+    blocked = (occupancy['W'] | occupancy['B']) & between
+    if blocked:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Path from %s to %s is blocked.", from_pos, to_pos)
         return False
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Path is clear.")
+    return True
+
+
+def check_ray(board: 'Board', from_pos: Position, to_pos: Position) -> Tuple[bool, Optional['Piece']]:
+    """
+    Checks if the path between two positions is clear and reads the piece at its end.
+
+    For callers deciding whether a move is a capture, which need both answers.
+
+    :param board: The game board.
+    :param from_pos: Starting position (x, y, z).
+    :param to_pos: Ending position (x, y, z).
+    :return: (clear, piece) where clear is as for is_clear_path and piece is the
+             piece at to_pos, or None if that square is empty or off the board.
+    """
+    return is_clear_path(board, from_pos, to_pos), board.get_piece(to_pos)
+
+
+def is_clear_path_many(board: 'Board', from_pos: Union[Position, np.ndarray], to_positions: np.ndarray) -> np.ndarray:
+    """
+    Checks many paths at once, e.g. for move generation over one piece or a whole position.
+
+    Every path is walked together as array operations over the flat
+    mailbox, with the same rules as is_clear_path.
+
+    :param board: The game board.
+    :param from_pos: Starting position (x, y, z) shared by every path, or an
+                     integer array of shape (n, 3) with one start per path.
+    :param to_positions: An integer array of ending positions, shape (n, 3).
+    :return: A boolean array of shape (n,), True where the path is clear.
+    """
+    tos = np.asarray(to_positions, dtype=np.intp).reshape(-1, 3)
+    origins = np.asarray(from_pos, dtype=np.intp).reshape(-1, 3)
+    deltas = tos - origins
+    magnitudes = np.abs(deltas)
+    steps = magnitudes.max(axis=1, initial=0)
+    shape = (board._nx, board._ny, board._nz)
+    # The same bounds and line rules as is_clear_path, one row per path
+    on_board = ((origins >= 0) & (origins < shape)).all(axis=1) & ((tos >= 0) & (tos < shape)).all(axis=1)
+    on_line = ((magnitudes == 0) | (magnitudes == steps[:, None])).all(axis=1)
+
+    # Squares strictly between the endpoints, one row per path, padded to the longest
+    k = np.arange(1, max(int(steps.max(initial=0)), 1))
+    squares = origins[:, None, :] + np.sign(deltas)[:, None, :] * k[None, :, None]
+    readable = (k < steps[:, None]) & (on_board & on_line)[:, None]
+    flat = squares @ np.array((board._stride_x, board._stride_y, 1), dtype=np.intp)
+    blocked = (readable & (board._mailbox[np.where(readable, flat, 0)] != 0)).any(axis=1)
+
+    # As in is_clear_path, the empty path from a square to itself is always clear
+    return (on_board & on_line & ~blocked) | (steps == 0)